@@ -3,44 +3,185 @@ import concurrent.futures
 import time
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.connection import allowed_gai_family
 import logging
 import csv
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+import sqlite3
+import threading
+import queue
+import socket
+import shelve
+import hashlib
+import shutil
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode
+import lxml.html
+from lxml import etree
 from tqdm import tqdm
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Optional, Union
 import undetected_chromedriver as uc
-import time
 
 
-# Set up logging
-logging.basicConfig(filename='abstract_downloader.log', level=logging.DEBUG,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+# Log file for the run; main() sets the level (INFO, or DEBUG with --verbose)
+LOG_FILE: str = 'abstract_downloader.log'
 
 # Ensure the download directory exists
 DOWNLOAD_DIR: str = "downloaded_abstracts"
 os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 
-# CSV file to log downloads and manage cache
+# Seconds to wait for the server to connect or send data before a PDF request is retried or fails
+DOWNLOAD_TIMEOUT: int = 30
+
+# Size of each chunk read from the download stream
+CHUNK_SIZE: int = 128 * 1024
+
+class _HashingWriter:
+    '''File wrapper that feeds every chunk written through it into a hash'''
+
+    def __init__(self, file, digest) -> None:
+        self._file = file
+        self._digest = digest
+
+    def write(self, data) -> int:
+        self._digest.update(data)
+        return self._file.write(data)
+
+# Seconds a resolved address is reused before the host is looked up again
+DNS_CACHE_TTL: int = 300
+_dns_cache: dict = {}
+_dns_cache_lock = threading.Lock()
+_getaddrinfo = socket.getaddrinfo
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    '''socket.getaddrinfo with a TTL cache, so new pooled connections skip repeated DNS lookups'''
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    with _dns_cache_lock:
+        cached = _dns_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    result = _getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_cache_lock:
+        _dns_cache[key] = (now + DNS_CACHE_TTL, result)
+    return result
+
+def install_dns_cache() -> None:
+    '''Route every socket.getaddrinfo call in this process through the DNS cache'''
+    socket.getaddrinfo = _cached_getaddrinfo
+
+# SQLite database logging downloads and managing the cache, with one row per download URL
+DOWNLOAD_DB: str = "download_log.db"
+# CSV log used by earlier versions; imported into a new database and written by --export_csv
 DOWNLOAD_LOG: str = "download_log.csv"
+LOG_FIELDNAMES: List[str] = ['datetime', 'start_url', 'download_url', 'file_name', 'status', 'content_sha1', 'etag', 'last_modified']
+# Statuses that mean a download URL needs no further attempts
+DONE_STATUSES: frozenset = frozenset({'success', 'duplicate'})
+
+DOWNLOAD_DB_SCHEMA: str = '''
+CREATE TABLE IF NOT EXISTS downloads (
+    datetime TEXT NOT NULL,
+    start_url TEXT NOT NULL,
+    download_url TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    content_sha1 TEXT NOT NULL DEFAULT '',
+    etag TEXT NOT NULL DEFAULT '',
+    last_modified TEXT NOT NULL DEFAULT ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS downloads_download_url ON downloads(download_url);
+CREATE INDEX IF NOT EXISTS downloads_content_sha1 ON downloads(content_sha1);
+'''
+
+# Keep the latest attempt per URL, except that a failure never replaces a completed download
+DOWNLOAD_DB_UPSERT: str = '''
+INSERT INTO downloads (datetime, start_url, download_url, file_name, status, content_sha1, etag, last_modified)
+VALUES (:datetime, :start_url, :download_url, :file_name, :status, :content_sha1, :etag, :last_modified)
+ON CONFLICT(download_url) DO UPDATE SET
+    datetime = excluded.datetime, start_url = excluded.start_url, file_name = excluded.file_name,
+    status = excluded.status, content_sha1 = excluded.content_sha1, etag = excluded.etag,
+    last_modified = excluded.last_modified
+WHERE downloads.status = 'failed' OR excluded.status != 'failed'
+'''
+
+# Shelve file caching the abstract URLs scraped from each listing page
+URL_CACHE: str = "url_cache.db"
+URL_CACHE_TTL: int = 24 * 60 * 60
+
+# Precompiled XPath queries for the cards, abstract links and "Next" button on a listing page
+CARD_COUNT_XPATH: etree.XPath = etree.XPath(
+    "count(//a[contains(concat(' ', normalize-space(@class), ' '), ' card-format ')])"
+)
+ABSTRACT_LINKS_XPATH: etree.XPath = etree.XPath(
+    "//a[contains(concat(' ', normalize-space(@class), ' '), ' card-format ')]"
+    "[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'abstract')]/@href"
+)
+NEXT_LINK_XPATH: etree.XPath = etree.XPath(
+    "//li[contains(concat(' ', normalize-space(@class), ' '), ' page-item__arrow--next ')]"
+    "//a[contains(concat(' ', normalize-space(@class), ' '), ' page-link ')]/@href"
+)
+
+# Chrome flags for the Selenium fallback, which only needs page HTML
+CHROME_FLAGS: List[str] = [
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-dev-shm-usage',
+    '--blink-settings=imagesEnabled=false',
+    '--disk-cache-size=0',
+]
+
+# Number of listing pages fetched concurrently
+LISTING_THREADS: int = 8
 
 class Webdriver:
     BASE_URL = "https://ascopubs.org"
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
+    }
 
-    def __init__(self) -> None:
-        self.__start()
-        self.download_history = self.__load_download_history()
+    def __init__(self, revalidate: bool = False) -> None:
+        # Chrome is only started if a listing page needs the Selenium fallback
+        self.driver = None
+        self.session = self.__create_session()
+        self.revalidate = revalidate
+        self._new_downloads: set = set()
+        self._new_hashes: set = set()
+        self._new_downloads_lock = threading.Lock()
+        self.__open_download_db()
 
     def __start(self) -> None:
         '''Private: Start the undetected Chrome WebDriver'''
         logging.debug("Starting undetected Chrome WebDriver...")
-        self.driver = uc.Chrome()
+        options = uc.ChromeOptions()
+        for flag in CHROME_FLAGS:
+            options.add_argument(flag)
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        # undetected_chromedriver adds --headless=new and --no-sandbox itself
+        self.driver = uc.Chrome(options=options, headless=True)
+        # undetected_chromedriver appends its own --window-size after ours, so size the window once it is up
+        self.driver.set_window_size(1280, 1024)
         self.driver.delete_all_cookies()
+        self._consent_pending = True
+
+    def __create_session(self) -> requests.Session:
+        '''Private: Create a shared HTTP session so connections are reused across downloads'''
+        session = requests.Session()
+        session.headers.update(self.HEADERS)
+        # Retry transient failures with short jittered backoff; other 4xx responses fail on the first attempt
+        retries = Retry(total=5, backoff_factor=0.5, backoff_jitter=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods={"GET"}, respect_retry_after_header=True)
+        session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retries))
+        # Resolve the publisher once up front, the same way urllib3 does, so the DNS cache is warm
+        try:
+            socket.getaddrinfo(urlparse(self.BASE_URL).hostname, 443, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            logging.error("Could not resolve %s: %s", self.BASE_URL, e)
+        return session
 
     def __consent_to_cookies(self) -> None:
         '''Private: Consent to cookies if prompted'''
@@ -54,136 +195,354 @@ class Webdriver:
             consent_banner.click()
             logging.debug("Consent banner clicked.")
         except Exception as e:
-            logging.error(f"Consent banner not found or could not be clicked: {str(e)}")
-
-    def __load_download_history(self) -> set:
-        '''Load download history from the CSV log file'''
-        if os.path.exists(DOWNLOAD_LOG):
-            with open(DOWNLOAD_LOG, 'r', newline='') as csvfile:
-                reader = csv.DictReader(csvfile)
-                return {row['download_url'] for row in reader if row['status'] == 'success'}
-        return set()
-
-    def __log_download(self, start_url: str, download_url: str, file_name: str, status: str) -> None:
-        '''Log the download attempt to the CSV log file'''
-        with open(DOWNLOAD_LOG, 'a', newline='') as csvfile:
-            fieldnames = ['datetime', 'start_url', 'download_url', 'file_name', 'status']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if os.stat(DOWNLOAD_LOG).st_size == 0:
-                writer.writeheader()
-            writer.writerow({
-                'datetime': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'start_url': start_url,
-                'download_url': download_url,
-                'file_name': file_name,
-                'status': status
-            })
-
-    def get_abstract_urls(self, url: str, max_pages: int) -> list:
-        '''Retrieve all abstract URLs from multiple pages using Selenium to handle complex interactions'''
-        logging.debug(f"Fetching abstract URLs from {url}")
-        abstract_urls = []
+            logging.error("Consent banner not found or could not be clicked: %s", e)
+
+    def __open_download_db(self) -> None:
+        '''Private: Open the download database, creating it from the legacy CSV log if needed'''
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(DOWNLOAD_DB, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(DOWNLOAD_DB_SCHEMA)
+        empty = self._db.execute('SELECT 1 FROM downloads LIMIT 1').fetchone() is None
+        if empty and os.path.exists(DOWNLOAD_LOG):
+            self.__import_download_log()
+
+    def __import_download_log(self) -> None:
+        '''Private: Copy the rows of the legacy CSV log into the download database'''
+        logging.info("Importing %s into %s", DOWNLOAD_LOG, DOWNLOAD_DB)
+        with open(DOWNLOAD_LOG, 'r', newline='') as csvfile:
+            rows = [{field: row.get(field) or '' for field in LOG_FIELDNAMES} for row in csv.DictReader(csvfile)]
+        with self._db_lock:
+            self._db.execute('BEGIN')
+            self._db.executemany(DOWNLOAD_DB_UPSERT, rows)
+            self._db.execute('COMMIT')
+
+    def export_download_log(self) -> None:
+        '''Write the download database out as a CSV log file'''
+        with self._db_lock:
+            rows = self._db.execute(f"SELECT {', '.join(LOG_FIELDNAMES)} FROM downloads ORDER BY rowid").fetchall()
+        with open(DOWNLOAD_LOG, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=LOG_FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(dict(row) for row in rows)
+        logging.info("Exported %d downloads to %s", len(rows), DOWNLOAD_LOG)
+
+    def __lookup_download(self, download_url: str) -> Optional[sqlite3.Row]:
+        '''Private: Fetch the logged row for a download URL, if any'''
+        with self._db_lock:
+            return self._db.execute('SELECT * FROM downloads WHERE download_url = ?', (download_url,)).fetchone()
+
+    def __content_saved(self, content_sha1: str, download_url: str) -> bool:
+        '''Private: Check whether a PDF with this content hash was saved from another URL in a previous run'''
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT 1 FROM downloads WHERE content_sha1 = ? AND status = 'success' AND download_url != ? LIMIT 1",
+                (content_sha1, download_url)
+            ).fetchone() is not None
+
+    def __log_download(self, start_url: str, download_url: str, file_name: str, status: str,
+                       content_sha1: str = '', etag: str = '', last_modified: str = '') -> None:
+        '''Log the download attempt to the download database'''
+        row = {
+            'datetime': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'start_url': start_url,
+            'download_url': download_url,
+            'file_name': file_name,
+            'status': status,
+            'content_sha1': content_sha1,
+            'etag': etag,
+            'last_modified': last_modified
+        }
+        with self._db_lock:
+            self._db.execute(DOWNLOAD_DB_UPSERT, row)
+
+    def __cache_key(self, url: str, page: int) -> str:
+        '''Private: Build the URL cache key for a listing page'''
+        return hashlib.sha1(f"{url}\0{page}".encode()).hexdigest()
+
+    def __parse_listing(self, html: Union[str, bytes], page_url: str) -> dict:
+        '''Private: Collect the card count, abstract URLs and next page URL from a listing page'''
+        tree = lxml.html.fromstring(html)
+        urls = [urljoin(page_url, href) for href in ABSTRACT_LINKS_XPATH(tree)]
+        next_hrefs = NEXT_LINK_XPATH(tree)
+        next_url = urljoin(page_url, next_hrefs[0]) if next_hrefs else None
+        cards = int(CARD_COUNT_XPATH(tree))
+        return {'cards': cards, 'urls': urls, 'next_url': next_url, 'expires': time.time() + URL_CACHE_TTL}
+
+    def __fetch_page(self, page_url: str) -> Optional[dict]:
+        '''Private: Fetch a listing page as static HTML over the shared session'''
+        try:
+            response = self.session.get(page_url, timeout=10)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logging.debug("Static fetch of %s failed: %s", page_url, e)
+            return None
         try:
-            self.driver.get(url)
+            # Bytes let lxml honour the page's own encoding declaration
+            return self.__parse_listing(response.content, page_url)
+        except (etree.ParserError, ValueError) as e:
+            logging.debug("Could not parse static HTML of %s: %s", page_url, e)
+            return None
+
+    def __scrape_page(self, page_url: str) -> dict:
+        '''Private: Load a listing page in Selenium and collect its abstract URLs and next page URL'''
+        if self.driver is None:
+            self.__start()
+        old_cards = self.driver.find_elements(By.CLASS_NAME, 'card-format')
+        self.driver.get(page_url)
+        if self._consent_pending:
             self.__consent_to_cookies()
-            for page in range(max_pages):
-                logging.debug(f"Processing page {page + 1} of abstracts...")
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, 'card-format'))
-                )
-                logging.debug("Abstracts loaded successfully.")
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                abstract_urls.extend([urljoin(url, a['href']) for a in soup.find_all('a', class_='card-format') if 'abstract' in a.get_text().lower()])
-                
-                # Check if there's a "Next" button and click it
-                next_button = self.driver.find_elements(By.CSS_SELECTOR, "li.page-item__arrow--next a.page-link")
-                if next_button:
-                    next_href = next_button[0].get_attribute('href')
-                    next_url = urljoin(url, next_href)
-                    logging.debug(f"Next button found, moving to {next_url}...")
-                    self.driver.get(next_url)
-                    logging.debug("Waiting for next page to load...")
-                    time.sleep(2)  # Wait for the next page to load
-                    logging.debug("Next page loaded.")
-                else:
+            self._consent_pending = False
+        if old_cards:
+            logging.debug("Waiting for previous page to unload...")
+            WebDriverWait(self.driver, 10).until(EC.staleness_of(old_cards[0]))
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.CLASS_NAME, 'card-format'))
+        )
+        logging.debug("Abstracts loaded successfully.")
+        return self.__parse_listing(self.driver.page_source, page_url)
+
+    def __page_urls(self, url: str, next_url: str, max_pages: int) -> Optional[List[str]]:
+        '''Private: Derive the URLs of pages 2..max_pages from the startPage parameter, if the listing uses one'''
+        parsed = urlparse(next_url)
+        # Ordered pairs keep repeated and blank query parameters, so only startPage changes between pages
+        next_pairs = parse_qsl(parsed.query, keep_blank_values=True)
+        start_pairs = [value for key, value in parse_qsl(urlparse(url).query, keep_blank_values=True) if key == 'startPage']
+        next_starts = [value for key, value in next_pairs if key == 'startPage']
+        try:
+            start = int(start_pairs[0]) if start_pairs else 0
+            step = int(next_starts[0]) - start
+        except (IndexError, ValueError):
+            return None
+        if step <= 0:
+            return None
+        page_urls = []
+        for page in range(1, max_pages):
+            page_start = str(start + page * step)
+            pairs = [(key, page_start if key == 'startPage' else value) for key, value in next_pairs]
+            page_urls.append(urlunparse(parsed._replace(query=urlencode(pairs))))
+        return page_urls
+
+    def __cached_page(self, cache: shelve.Shelf, url: str, page: int, refresh: bool) -> Optional[dict]:
+        '''Private: Return the unexpired cache entry for a listing page, if any'''
+        entry = None if refresh else cache.get(self.__cache_key(url, page))
+        if entry is not None and entry['expires'] > time.time():
+            logging.debug("Using cached abstract URLs for page %d", page + 1)
+            return entry
+        return None
+
+    def __load_page(self, cache: shelve.Shelf, url: str, page: int, page_url: str, entry: Optional[dict]) -> dict:
+        '''Private: Fall back to Selenium when the static fetch found nothing, then store the page in the cache'''
+        if entry is None or not entry['cards']:
+            logging.debug("No cards in static HTML for page %d, falling back to Selenium...", page + 1)
+            entry = self.__scrape_page(page_url)
+        cache[self.__cache_key(url, page)] = entry
+        return entry
+
+    def get_abstract_urls(self, url: str, max_pages: int, refresh: bool = False) -> Iterator[str]:
+        '''Yield abstract URLs page by page as they are found, reusing cached pages unless refresh is set'''
+        logging.debug("Fetching abstract URLs from %s", url)
+        try:
+            with shelve.open(URL_CACHE) as cache:
+                first_entry = self.__cached_page(cache, url, 0, refresh)
+                if first_entry is None:
+                    first_entry = self.__load_page(cache, url, 0, url, self.__fetch_page(url))
+                entry = first_entry
+                yield from entry['urls']
+                if not entry['next_url'] or max_pages <= 1:
                     logging.debug("No more pages found.")
-                    break
+                    return
+
+                page_urls = self.__page_urls(url, entry['next_url'], max_pages)
+                if page_urls is None:
+                    logging.debug("Could not infer page URLs, walking the listing sequentially...")
+                    page_url = entry['next_url']
+                    for page in range(1, max_pages):
+                        entry = self.__cached_page(cache, url, page, refresh)
+                        if entry is None:
+                            entry = self.__load_page(cache, url, page, page_url, self.__fetch_page(page_url))
+                        yield from entry['urls']
+                        if not entry['next_url']:
+                            break
+                        page_url = entry['next_url']
+                    return
+
+                # The page-0 entry remembers the last page found, so pages past it are not requested again
+                page_count = min(max_pages, first_entry.get('last_page', max_pages - 1) + 1)
+                entries = {page: self.__cached_page(cache, url, page, refresh) for page in range(1, page_count)}
+                missing = [page for page, cached in entries.items() if cached is None]
+                logging.debug("Fetching %d listing pages concurrently...", len(missing))
+                with concurrent.futures.ThreadPoolExecutor(max_workers=LISTING_THREADS) as executor:
+                    fetches = {page: executor.submit(self.__fetch_page, page_urls[page - 1]) for page in missing}
+                    for page in range(1, page_count):
+                        logging.debug("Processing page %d of abstracts...", page + 1)
+                        entry = entries[page]
+                        if page in fetches:
+                            entry = self.__load_page(cache, url, page, page_urls[page - 1], fetches[page].result())
+                        yield from entry['urls']
+                        if not entry['next_url']:
+                            logging.debug("No more pages found.")
+                            executor.shutdown(cancel_futures=True)
+                            if first_entry.get('last_page') != page:
+                                first_entry['last_page'] = page
+                                cache[self.__cache_key(url, 0)] = first_entry
+                            break
         except Exception as e:
-            logging.error(f"Error fetching abstract URLs: {str(e)}")
-        return abstract_urls
+            logging.error("Error fetching abstract URLs: %s", e)
 
     def convert_to_download_url(self, abstract_url: str) -> str:
         '''Convert the abstract URL to the download URL'''
         return abstract_url.replace("/doi/abs/", "/doi/pdfdirect/")
 
+    def needs_download(self, download_url: str) -> bool:
+        '''Check whether the download URL still has to be fetched, or revalidated when revalidate is set'''
+        with self._new_downloads_lock:
+            if download_url in self._new_downloads:
+                return False
+        row = self.__lookup_download(download_url)
+        if row is not None and row['status'] in DONE_STATUSES:
+            return self.revalidate and row['status'] == 'success'
+        return True
+
     def download_abstract(self, abstract_url: str) -> None:
         '''Download the abstract by converting its URL to the download URL'''
-        logging.debug(f"Downloading abstract from {abstract_url}")
+        logging.debug("Downloading abstract from %s", abstract_url)
         try:
             download_url = self.convert_to_download_url(abstract_url)
             file_name = download_url.split("/")[-1] + ".pdf"
 
-            if download_url in self.download_history:
-                logging.info(f"Skipping already downloaded file: {file_name}")
+            if not self.needs_download(download_url):
+                logging.info("Skipping already downloaded file: %s", file_name)
                 return
 
             self.__save_article(abstract_url, download_url, file_name)
         except Exception as e:
-            logging.error(f"Error downloading abstract: {str(e)}")
+            logging.error("Error downloading abstract: %s", e)
             self.__log_download(abstract_url, download_url, file_name, 'failed')
 
+    def __record_unchanged(self, start_url: str, download_url: str, file_name: str,
+                           content_sha1: str, etag: str, last_modified: str) -> None:
+        '''Private: Log a revalidated PDF whose saved file is still current'''
+        with self._new_downloads_lock:
+            self._new_downloads.add(download_url)
+        self.__log_download(start_url, download_url, file_name, 'success', content_sha1, etag, last_modified)
+
     def __save_article(self, start_url: str, download_url: str, file_name: str) -> None:
         '''Private: Save the article to the local directory and log the result'''
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
-        }
-        attempt = 0
-        while attempt <= 5:
+        file_path = os.path.join(DOWNLOAD_DIR, file_name)
+        previous = {}
+        row = self.__lookup_download(download_url)
+        if row is not None and row['status'] == 'success' and os.path.exists(file_path):
+            previous = {field: row[field] for field in ('content_sha1', 'etag', 'last_modified')}
+        headers = {}
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+
+        logging.debug("Sending request to download PDF from %s...", download_url)
+        with self.session.get(download_url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            if response.status_code == 304:
+                logging.info("Not modified since last download: %s", file_path)
+                self.__record_unchanged(start_url, download_url, file_name, **previous)
+                return
+            etag = response.headers.get('ETag', '')
+            last_modified = response.headers.get('Last-Modified', '')
+            logging.debug("Saving PDF to %s...", file_path)
+            part_path = file_path + '.part'
+            response.raw.decode_content = True
+            digest = hashlib.sha1()
             try:
-                logging.debug(f"Sending request to download PDF from {download_url}...")
-                response = requests.get(download_url, headers=headers, stream=True)
-                response.raise_for_status()
-                if response.status_code == 200:
-                    file_path = os.path.join(DOWNLOAD_DIR, file_name)
-                    logging.debug(f"Saving PDF to {file_path}...")
-                    with open(file_path, 'wb') as pdf_file:
-                        for chunk in response.iter_content(chunk_size=1024):
-                            if chunk:
-                                pdf_file.write(chunk)
-                    logging.info(f"Downloaded and saved to {file_path}")
-                    self.__log_download(start_url, download_url, file_name, 'success')
-                    self.download_history.add(download_url)
-                    return
-                else:
-                    logging.error(f"Failed to download file from {download_url}. Status code: {response.status_code}")
-                    self.__log_download(start_url, download_url, file_name, 'failed')
-            except Exception as e:
-                logging.error(f"Error saving article retrying: {str(e)}")
-                attempt += 1
-                wait_time = 2 ** attempt
-                print(f"Attempt {attempt} failed: {e}. Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
-                
-        self.__log_download(start_url, download_url, file_name, 'failed')    
-        
+                with open(part_path, 'wb') as pdf_file:
+                    shutil.copyfileobj(response.raw, _HashingWriter(pdf_file, digest), CHUNK_SIZE)
+            except Exception:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+
+        content_sha1 = digest.hexdigest()
+        # A revalidated URL that returns its own earlier bytes is unchanged, not a copy of another PDF
+        if content_sha1 == previous.get('content_sha1'):
+            os.remove(part_path)
+            logging.info("Content unchanged since last download: %s", file_path)
+            self.__record_unchanged(start_url, download_url, file_name, content_sha1, etag, last_modified)
+            return
+        saved_before = self.__content_saved(content_sha1, download_url)
+        with self._new_downloads_lock:
+            duplicate = saved_before or content_sha1 in self._new_hashes
+            self._new_hashes.add(content_sha1)
+            self._new_downloads.add(download_url)
+        if duplicate:
+            os.remove(part_path)
+            logging.info("Skipping %s: identical content was already saved (sha1 %s)", file_name, content_sha1)
+            self.__log_download(start_url, download_url, file_name, 'duplicate', content_sha1, etag, last_modified)
+            return
+        os.replace(part_path, file_path)
+        logging.info("Downloaded and saved to %s", file_path)
+        self.__log_download(start_url, download_url, file_name, 'success', content_sha1, etag, last_modified)
 
     def close(self):
         '''Close the WebDriver'''
-        logging.debug("Closing Safari WebDriver...")
-        self.driver.quit()
+        self.session.close()
+        with self._db_lock:
+            self._db.close()
+        if self.driver is not None:
+            logging.debug("Closing Chrome WebDriver...")
+            self.driver.quit()
+
+def produce_urls(driver: Webdriver, url_queue: queue.Queue, progress: tqdm, args: argparse.Namespace) -> None:
+    '''Queue each new abstract URL as soon as the listing scrape finds it, then one stop sentinel per consumer'''
+    seen = set()
+    try:
+        for url in driver.get_abstract_urls(args.url, args.max_pages, refresh=args.refresh):
+            if url in seen or not driver.needs_download(driver.convert_to_download_url(url)):
+                continue
+            seen.add(url)
+            progress.total = len(seen)
+            progress.refresh()
+            url_queue.put(url)
+        logging.info("Queued %d abstract URLs for download", len(seen))
+    finally:
+        for _ in range(args.max_threads):
+            url_queue.put(None)
+
+def consume_urls(driver: Webdriver, url_queue: queue.Queue, progress: tqdm) -> None:
+    '''Download queued abstract URLs until the stop sentinel arrives'''
+    while (url := url_queue.get()) is not None:
+        driver.download_abstract(url)
+        progress.update(1)
 
 def main():
     parser = argparse.ArgumentParser(description="Download abstracts from a specified URL.")
     parser.add_argument('url', type=str, help='URL to scrape for abstracts')
     parser.add_argument('--max_pages', type=int, default=10, help='Maximum number of pages to scrape')
-    parser.add_argument('--max_threads', type=int, default=5, help='Maximum number of threads for downloading')
+    parser.add_argument('--max_threads', type=int, default=32, help='Maximum number of threads for downloading')
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached listing pages and scrape them again')
+    parser.add_argument('--revalidate', action='store_true', help='Re-check downloaded PDFs with conditional requests instead of skipping them')
+    parser.add_argument('--export_csv', action='store_true', help=f'Write the download log to {DOWNLOAD_LOG} after the run')
+    parser.add_argument('--verbose', action='store_true', help='Write DEBUG messages to the log file')
     args = parser.parse_args()
 
-    driver = Webdriver()
+    # Set up logging
+    logging.basicConfig(filename=LOG_FILE, level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    install_dns_cache()
+    driver = Webdriver(revalidate=args.revalidate)
     try:
-        urls = driver.get_abstract_urls(args.url, args.max_pages)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=args.max_threads) as executor:
-            list(tqdm(executor.map(driver.download_abstract, urls), total=len(urls), desc="Downloading abstracts"))
+        url_queue: queue.Queue = queue.Queue()
+        with tqdm(total=0, desc="Downloading abstracts") as progress:
+            producer = threading.Thread(target=produce_urls, args=(driver, url_queue, progress, args))
+            consumers = [threading.Thread(target=consume_urls, args=(driver, url_queue, progress)) for _ in range(args.max_threads)]
+            for thread in [producer, *consumers]:
+                thread.start()
+            for thread in [producer, *consumers]:
+                thread.join()
+        if args.export_csv:
+            driver.export_download_log()
     finally:
         driver.close()
 